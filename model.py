@@ -1,13 +1,13 @@
 # model.py
 import pandas as pd
 import numpy as np
-from utils import load_transactions
+from utils import CSV_FILE, load_transactions
 from sklearn.linear_model import LinearRegression
 
 
-def forecast_next_6_months():
+def forecast_next_6_months(csv_file=CSV_FILE):
 
-    df = load_transactions()
+    df = load_transactions(csv_file)
     if df.empty:
         return None, None, None
 
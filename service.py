@@ -0,0 +1,444 @@
+# service.py
+"""
+Headless JSON service for the MoneyMonkey analytics.
+
+Serves the same forecast, feasibility and health score as the Streamlit app,
+without importing Streamlit. Ledgers and computed results stay cached in the
+process between requests and are refreshed when a ledger file changes.
+
+    python service.py serve --ledger churro=sample_data_sheet1.csv --port 8000
+    python service.py loadtest --url http://127.0.0.1:8000 --user churro
+"""
+import argparse
+import inspect
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from model import forecast_next_6_months
+from utils import (
+    CSV_FILE,
+    calculate_financial_health,
+    check_goal_feasibility,
+    ledger_signature,
+    spending_by_weekday,
+)
+
+RESULT_CACHE_SIZE = 256
+MAX_MONTHS = 120
+WEEKDAYS = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
+
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def forecast_query(csv_file):
+    actual_df, forecast_df, explanation = forecast_next_6_months(csv_file)
+    if actual_df is None:
+        return {"actual": None, "forecast": None, "explanation": None}
+    return {
+        "actual": actual_df[["date", "cumulative_balance"]],
+        "forecast": forecast_df,
+        "explanation": explanation,
+    }
+
+
+def weekday_query(csv_file):
+    weekday_avg, max_day, min_day = spending_by_weekday(csv_file)
+    return {"weekday_avg": weekday_avg, "max_day": max_day, "min_day": min_day}
+
+
+def parse_amount(name, value):
+    if isinstance(value, bool):
+        raise ServiceError(400, f"'{name}' must be a number.")
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise ServiceError(400, f"'{name}' must be a number.")
+    if not np.isfinite(amount) or amount < 0:
+        raise ServiceError(400, f"'{name}' must be a non-negative number.")
+    return amount
+
+
+def parse_months(value):
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ServiceError(400, "'months' must be a positive integer.")
+    if value > MAX_MONTHS:
+        raise ServiceError(400, f"'months' must be at most {MAX_MONTHS}.")
+    return value
+
+
+def parse_completed(value):
+    """
+    Accepts a JSON list of booleans, or a comma-separated "true,false,..."
+    string as sent in a GET query.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        flags = []
+        for item in value.split(","):
+            item = item.strip().lower()
+            if item not in ("true", "false"):
+                raise ServiceError(400, "'completed' must be a comma-separated list of true/false.")
+            flags.append(item == "true")
+        return flags
+    if isinstance(value, list) and all(isinstance(c, bool) for c in value):
+        return value
+    raise ServiceError(400, "'completed' must be a list of booleans.")
+
+
+def feasibility_query(csv_file, goal_type, goal_amount, months,
+                      day=None, start_date=None):
+    if not isinstance(goal_type, str):
+        raise ServiceError(400, "'goal_type' must be a string.")
+    if day is not None and day not in WEEKDAYS:
+        raise ServiceError(400, f"'day' must be one of {', '.join(WEEKDAYS)}.")
+    if start_date is not None:
+        try:
+            start_date = pd.to_datetime(start_date)
+        except (TypeError, ValueError, OverflowError):
+            raise ServiceError(400, "'start_date' must be a date.")
+        if not isinstance(start_date, pd.Timestamp) or pd.isna(start_date):
+            raise ServiceError(400, "'start_date' must be a date.")
+    explanation, checkpoints = check_goal_feasibility(
+        goal_type,
+        parse_amount("goal_amount", goal_amount),
+        parse_months(months),
+        day=day,
+        start_date=start_date,
+        csv_file=csv_file
+    )
+    return {"explanation": explanation, "checkpoints": checkpoints}
+
+
+def health_query(csv_file, completed=None):
+    goal_checkpoints = None
+    completed = parse_completed(completed)
+    if completed:
+        goal_checkpoints = pd.DataFrame({"Completed": completed})
+    score, summary = calculate_financial_health(goal_checkpoints, csv_file=csv_file)
+    return {"score": score, "summary": summary}
+
+
+QUERIES = {
+    "forecast": forecast_query,
+    "weekday": weekday_query,
+    "feasibility": feasibility_query,
+    "health": health_query,
+}
+
+
+def to_json(obj):
+    if isinstance(obj, pd.DataFrame):
+        return json.loads(obj.to_json(orient="records", date_format="iso"))
+    if isinstance(obj, pd.Series):
+        return json.loads(obj.to_json(date_format="iso"))
+    if isinstance(obj, (pd.Timestamp, date)):
+        return obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+class AnalyticsService:
+    """
+    Runs queries against per-user ledgers, memoizing serialized results
+    until the ledger file changes. Concurrent misses on the same key wait
+    for a single computation instead of each running the query.
+    """
+
+    def __init__(self, ledgers, cache_size=RESULT_CACHE_SIZE):
+        self.ledgers = dict(ledgers)
+        self.cache_size = cache_size
+        self._results = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def run(self, user, op, params=None):
+        if not isinstance(user, str):
+            raise ServiceError(400, "'user' must be a string.")
+        if not isinstance(op, str):
+            raise ServiceError(400, "'op' must be a string.")
+        if user not in self.ledgers:
+            raise ServiceError(404, f"Unknown user '{user}'.")
+        if op not in QUERIES:
+            raise ServiceError(404, f"Unknown query '{op}'.")
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise ServiceError(400, "'params' must be a JSON object.")
+        query = QUERIES[op]
+        try:
+            inspect.signature(query).bind(None, **params)
+        except TypeError as e:
+            raise ServiceError(400, f"Bad parameters for '{op}': {e}")
+        csv_file = self.ledgers[user]
+
+        key = (user, op, json.dumps(params, sort_keys=True))
+        try:
+            signature = ledger_signature(csv_file)
+        except OSError as e:
+            raise ServiceError(500, f"Cannot read ledger for '{user}': {e}")
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None and cached[0] == signature:
+                self._results.move_to_end(key)
+                return cached[1]
+            future = self._inflight.get((key, signature))
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[(key, signature)] = future
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._compute(query, csv_file, user, op, params)
+        except ServiceError as e:
+            with self._lock:
+                del self._inflight[(key, signature)]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[(key, signature)]
+            self._results[key] = (signature, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        future.set_result(result)
+        return result
+
+    def _compute(self, query, csv_file, user, op, params):
+        try:
+            result = query(csv_file, **params)
+            # round-trip now so cached results are plain, shareable JSON values
+            return json.loads(json.dumps(result, default=to_json))
+        except ServiceError:
+            raise
+        except Exception as e:
+            raise ServiceError(500, f"Query '{op}' failed for '{user}': {e}")
+
+    def batch(self, queries):
+        if not isinstance(queries, list):
+            raise ServiceError(400, "'queries' must be a list.")
+        results = []
+        for query in queries:
+            try:
+                if not isinstance(query, dict):
+                    raise ServiceError(400, "Each query must be a JSON object.")
+                result = self.run(query.get("user"), query.get("op"), query.get("params"))
+                results.append({"ok": True, "result": result})
+            except ServiceError as e:
+                results.append({"ok": False, "status": e.status, "error": str(e)})
+            except Exception as e:
+                results.append({"ok": False, "status": 500, "error": f"Internal error: {e}"})
+        return results
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    GET  /ping
+    GET  /users
+    GET  /users/<user>/<op>?param=value
+    POST /users/<user>/<op>   {"param": value, ...}
+    POST /batch               {"queries": [{"user": ..., "op": ..., "params": {...}}]}
+    """
+
+    service = None
+    quiet = False
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        parts = self._path_parts(path)
+        if parts == ["ping"]:
+            return self._send(200, {"status": "ok"})
+        if parts == ["users"]:
+            return self._send(200, {"users": sorted(self.service.ledgers)})
+        if len(parts) == 3 and parts[0] == "users":
+            params = dict(urllib.parse.parse_qsl(query))
+            return self._handle(lambda: self.service.run(parts[1], parts[2], params))
+        self._send(404, {"error": "Not found."})
+
+    def do_POST(self):
+        parts = self._path_parts(self.path.partition("?")[0])
+        try:
+            body = self._read_json()
+        except ValueError:
+            return self._send(400, {"error": "Request body must be JSON."})
+        if parts == ["batch"]:
+            queries = body.get("queries", [])
+            return self._handle(lambda: {"results": self.service.batch(queries)})
+        if len(parts) == 3 and parts[0] == "users":
+            return self._handle(lambda: self.service.run(parts[1], parts[2], body))
+        self._send(404, {"error": "Not found."})
+
+    def _path_parts(self, path):
+        return [urllib.parse.unquote(p) for p in path.split("/") if p]
+
+    def _handle(self, fn):
+        try:
+            payload = fn()
+        except ServiceError as e:
+            return self._send(e.status, {"error": str(e)})
+        except Exception as e:
+            self.log_error("Unhandled error for %s: %r", self.path, e)
+            return self._send(500, {"error": f"Internal error: {e}"})
+        self._send(200, payload)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length == 0:
+            return {}
+        body = json.loads(self.rfile.read(length))
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object.")
+        return body
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, default=to_json).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(ledgers, host="127.0.0.1", port=8000, quiet=False):
+    handler = type("Handler", (RequestHandler,), {
+        "service": AnalyticsService(ledgers),
+        "quiet": quiet,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(ledgers, host="127.0.0.1", port=8000, quiet=False):
+    server = make_server(ledgers, host, port, quiet)
+    print(f"Serving {', '.join(sorted(ledgers))} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def load_test(url, user, op="health", requests=200, concurrency=8):
+    """
+    Fires `requests` GETs at one endpoint and returns latency stats in ms.
+    Failed requests are counted in `errors` and left out of the latencies.
+    """
+    if requests < 1:
+        raise ValueError("requests must be at least 1")
+    endpoint = f"{url.rstrip('/')}/users/{urllib.parse.quote(user)}/{op}"
+
+    def fetch(_):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(endpoint) as resp:
+                resp.read()
+        except urllib.error.HTTPError as e:
+            return None, f"HTTP {e.code}"
+        except OSError as e:
+            return None, str(getattr(e, "reason", e))
+        return (time.perf_counter() - start) * 1000, None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(fetch, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(ms for ms, error in outcomes if error is None)
+    errors = Counter(error for _, error in outcomes if error is not None)
+    stats = {
+        "requests": requests,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": sum(errors.values()),
+        "requests_per_sec": requests / elapsed,
+    }
+    if latencies:
+        stats.update({
+            "mean_ms": statistics.mean(latencies),
+            "p50_ms": latencies[len(latencies) // 2],
+            "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            "max_ms": latencies[-1],
+        })
+    for error, count in errors.most_common():
+        stats[f"error: {error}"] = count
+    return stats
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_ledgers(values):
+    ledgers = {}
+    for value in values or [f"default={CSV_FILE}"]:
+        user, sep, path = value.partition("=")
+        if not sep or not user or not path:
+            raise argparse.ArgumentTypeError(f"Expected USER=PATH, got '{value}'.")
+        ledgers[user] = path
+    return ledgers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MoneyMonkey analytics service")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="run the JSON service")
+    serve_parser.add_argument("--ledger", action="append", metavar="USER=PATH",
+                              help=f"ledger CSV per user (default: default={CSV_FILE})")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--quiet", action="store_true", help="disable request logging")
+
+    load_parser = sub.add_parser("loadtest", help="benchmark a running service")
+    load_parser.add_argument("--url", default="http://127.0.0.1:8000")
+    load_parser.add_argument("--user", default="default")
+    load_parser.add_argument("--op", default="health", choices=sorted(QUERIES))
+    load_parser.add_argument("--requests", type=positive_int, default=200)
+    load_parser.add_argument("--concurrency", type=positive_int, default=8)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            ledgers = parse_ledgers(args.ledger)
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        serve(ledgers, args.host, args.port, args.quiet)
+    else:
+        stats = load_test(args.url, args.user, args.op, args.requests, args.concurrency)
+        for name, value in stats.items():
+            print(f"{name:>18}: {value:.2f}" if isinstance(value, float) else f"{name:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# test_service.py
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import service as service_module
+import utils
+from service import MAX_MONTHS, AnalyticsService, ServiceError, make_server
+
+LEDGER = (
+    "date,amount,category,type\n"
+    "2025-08-19,8000.0,summer,income\n"
+    "2025-08-19,20.0,school,expense\n"
+    "2025-08-22,45.15,school,expense\n"
+    "2025-09-01,60.0,food,expense\n"
+)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    path = tmp_path / "ledger.csv"
+    path.write_text(LEDGER)
+    return str(path)
+
+
+@pytest.fixture
+def service(ledger):
+    return AnalyticsService({"churro": ledger, "big spender": ledger})
+
+
+def test_load_transactions_returns_a_copy(ledger):
+    df = utils.load_transactions(ledger)
+    df["amount"] = 0
+    df["extra"] = 1
+    again = utils.load_transactions(ledger)
+    assert "extra" not in again.columns
+    assert again["amount"].sum() == pytest.approx(8125.15)
+
+
+def test_editing_ledger_invalidates_caches(ledger, service):
+    before = service.run("churro", "weekday")
+    assert len(utils.load_transactions(ledger)) == 4
+
+    with open(ledger, "a") as f:
+        f.write("2025-09-02,500.0,rent,expense\n")
+
+    assert len(utils.load_transactions(ledger)) == 5
+    after = service.run("churro", "weekday")
+    assert after != before
+
+
+def test_add_transaction_invalidates_ledger_cache(ledger):
+    assert len(utils.load_transactions(ledger)) == 4
+    utils.add_transaction("2025-09-03", 12.5, "food", "expense", csv_file=ledger)
+    df = utils.load_transactions(ledger)
+    assert len(df) == 5
+    assert df["amount"].iloc[-1] == pytest.approx(12.5)
+
+
+def test_repeat_query_is_served_from_cache(ledger, service, monkeypatch):
+    reads = []
+    read_csv = utils.pd.read_csv
+
+    def counted_read_csv(*args, **kwargs):
+        reads.append(args)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(utils.pd, "read_csv", counted_read_csv)
+    calls = []
+    weekday_query = service_module.QUERIES["weekday"]
+
+    def counted(csv_file):
+        calls.append(csv_file)
+        return weekday_query(csv_file)
+
+    monkeypatch.setitem(service_module.QUERIES, "weekday", counted)
+    utils._LEDGER_CACHE.pop(ledger, None)
+
+    first = service.run("churro", "weekday")
+    second = service.run("churro", "weekday")
+    assert first == second
+    assert len(calls) == 1
+    assert len(reads) == 1
+
+
+def test_result_cache_is_bounded(ledger):
+    service = AnalyticsService({"churro": ledger}, cache_size=2)
+    for months in range(1, 6):
+        service.run("churro", "feasibility",
+                    {"goal_type": "Save X Amount", "goal_amount": 100, "months": months})
+        assert len(service._results) <= 2
+
+
+def test_concurrent_misses_compute_once(service, monkeypatch):
+    calls = []
+    release = threading.Event()
+    weekday_query = service_module.QUERIES["weekday"]
+
+    def slow(csv_file):
+        calls.append(csv_file)
+        release.wait(5)
+        return weekday_query(csv_file)
+
+    monkeypatch.setitem(service_module.QUERIES, "weekday", slow)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.run("churro", "weekday")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    while not calls:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(r == results[0] for r in results)
+
+
+def test_health_completed_parsing(service):
+    none_done = service.run("churro", "health", {"completed": "false,false"})
+    all_done = service.run("churro", "health", {"completed": [True, True]})
+    assert none_done["score"] < all_done["score"]
+    for bad in ("0", "false,yes", ["false", "0"], 1):
+        with pytest.raises(ServiceError) as e:
+            service.run("churro", "health", {"completed": bad})
+        assert e.value.status == 400
+
+
+@pytest.mark.parametrize("params", [
+    {"goal_type": "Save X Amount", "goal_amount": 100, "months": 0},
+    {"goal_type": "Save X Amount", "goal_amount": "lots", "months": 3},
+    {"goal_type": "Spend Less on X Day", "goal_amount": 5, "months": 1, "day": "Caturday"},
+    {"goal_type": "Save X Amount"},
+    {"goal_type": "Save X Amount", "goal_amount": 100, "months": MAX_MONTHS + 1},
+    {"goal_type": "Save X Amount", "goal_amount": 100, "months": 2, "start_date": ""},
+    {"goal_type": "Save X Amount", "goal_amount": 100, "months": 2,
+     "start_date": ["2025-01-01"]},
+])
+def test_feasibility_rejects_bad_params(service, params):
+    with pytest.raises(ServiceError) as e:
+        service.run("churro", "feasibility", params)
+    assert e.value.status == 400
+
+
+def test_batch_reports_each_query(service):
+    results = service.batch([
+        {"user": "churro", "op": "weekday"},
+        {"user": ["churro"], "op": "weekday"},
+        {"user": "nobody", "op": "health"},
+        {"user": "churro", "op": "feasibility",
+         "params": {"goal_type": "Save X Amount", "goal_amount": 100, "months": 0}},
+        "not a query",
+        {"user": "churro", "op": "feasibility",
+         "params": {"goal_type": "Save X Amount", "goal_amount": 100, "months": 2}},
+    ])
+    assert [r["ok"] for r in results] == [True, False, False, False, False, True]
+    assert [r.get("status") for r in results] == [None, 400, 404, 400, 400, None]
+
+
+def test_batch_reports_server_errors_per_query(tmp_path, ledger):
+    broken = tmp_path / "broken.csv"
+    broken.write_text("not,a,ledger\n1,2,3\n")
+    service = AnalyticsService({"churro": ledger, "broken": str(broken)})
+    results = service.batch([
+        {"user": "broken", "op": "health"},
+        {"user": "churro", "op": "weekday"},
+    ])
+    assert results[0]["ok"] is False and results[0]["status"] == 500
+    assert results[1]["ok"] is True
+
+
+@pytest.fixture
+def server(ledger):
+    server = make_server({"churro": ledger, "big spender": ledger}, port=0, quiet=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, body=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    try:
+        with urllib.request.urlopen(url, data=data) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_http_get_decodes_user(server):
+    status, body = request(f"{server}/users/big%20spender/weekday")
+    assert status == 200
+    assert "weekday_avg" in body
+
+
+def test_http_errors_are_json(server):
+    assert request(f"{server}/batch", {"queries": 3})[0] == 400
+    assert request(f"{server}/users/churro/health?completed=false")[0] == 200
+    assert request(f"{server}/users/churro/health?completed=0")[0] == 400
+    assert request(f"{server}/users/nobody/health")[0] == 404
@@ -1,17 +1,34 @@
 # utils.py
+import os
 import pandas as pd
 from datetime import date
 from dateutil.relativedelta import relativedelta
-import streamlit as st
 
 CSV_FILE = "sample_data_sheet1.csv"
 
-def load_transactions():
-    df = pd.read_csv(CSV_FILE, parse_dates=['date'])
-    return df
+# path -> (signature, DataFrame); reused until the file on disk changes
+_LEDGER_CACHE = {}
+
+def ledger_signature(csv_file=CSV_FILE):
+    """
+    Cheap fingerprint of a ledger file, changes whenever the file is rewritten.
+    """
+    stat = os.stat(csv_file)
+    return stat.st_mtime_ns, stat.st_size
+
+def load_transactions(csv_file=CSV_FILE):
+    signature = ledger_signature(csv_file)
+    cached = _LEDGER_CACHE.get(csv_file)
+    if cached is None or cached[0] != signature:
+        df = pd.read_csv(csv_file, parse_dates=['date'])
+        _LEDGER_CACHE[csv_file] = (signature, df)
+    else:
+        df = cached[1]
+    # callers add columns in place, so never hand out the cached frame
+    return df.copy()
 
-def add_transaction(date, amount, category, t_type):
-    df = load_transactions()
+def add_transaction(date, amount, category, t_type, csv_file=CSV_FILE):
+    df = load_transactions(csv_file)
     new_row = pd.DataFrame({
         'date': [pd.to_datetime(date)],
         'amount': [float(amount)],
@@ -20,11 +37,12 @@ def add_transaction(date, amount, category, t_type):
     })
     df = pd.concat([df, new_row], ignore_index=True)
     df = df.sort_values('date').reset_index(drop=True)
-    df.to_csv(CSV_FILE, index=False)
+    df.to_csv(csv_file, index=False)
+    _LEDGER_CACHE.pop(csv_file, None)
     return df
 
-def spending_by_weekday():
-    df = load_transactions()
+def spending_by_weekday(csv_file=CSV_FILE):
+    df = load_transactions(csv_file)
     if df.empty:
         return None, None, None
     expenses = df[df["type"]=="expense"].copy()
@@ -94,8 +112,8 @@ def generate_daily_reduction_checkpoints(goal_amount, months, day, start_date):
 
 def check_goal_feasibility(goal_type, goal_amount, months,
                            category=None, day=None,
-                           start_date=None):
-    df = load_transactions()
+                           start_date=None, csv_file=CSV_FILE):
+    df = load_transactions(csv_file)
     if df.empty:
         return "No transaction data to evaluate.", None
     df['signed_amount'] = df.apply(
@@ -141,13 +159,13 @@ def check_goal_feasibility(goal_type, goal_amount, months,
 
     return "Goal type not supported yet.", None
 
-def calculate_financial_health(goal_checkpoints = None):
+def calculate_financial_health(goal_checkpoints = None, csv_file=CSV_FILE):
     """
     Returns:
         score (int): 1-10 score
         summary (str): descriptive explanation of the score
     """
-    df = load_transactions()
+    df = load_transactions(csv_file)
     if df.empty:
         return 1, "No transactions yet. Unable to evaluate finances."
 
@@ -158,7 +176,7 @@ def calculate_financial_health(goal_checkpoints = None):
 
 
     from model import forecast_next_6_months
-    actual_df, forecast_df, _ = forecast_next_6_months()
+    actual_df, forecast_df, _ = forecast_next_6_months(csv_file)
     trend_score = 5
     trend_direction = "steady"
     if forecast_df is not None: